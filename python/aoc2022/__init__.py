@@ -1,3 +0,0 @@
-from . import (
-    day01, day02, day03, day04, day05, day06, day07, day08, day09, day10, day20
-)
@@ -0,0 +1,94 @@
+import json
+import statistics
+import time
+import tracemalloc
+from typing import Iterable, NamedTuple, Optional
+
+from .manager import AocManager
+
+
+__all__ = [
+    'BenchResult', 'bench',
+    'save_baseline', 'load_baseline', 'compare_to_baseline',
+]
+
+
+class BenchResult(NamedTuple):
+    day: int
+    part: int
+    runs: int
+    min: float          # seconds
+    median: float       # seconds
+    p95: float          # seconds
+    peak_memory: int    # bytes allocated at peak, as reported by tracemalloc
+    size: Optional[int] = None  # size of the generated input, if any
+
+    @property
+    def key(self) -> str:
+        if self.size is None:
+            return f'{self.day}/{self.part}'
+        return f'{self.day}/{self.part}@{self.size}'
+
+
+def bench(
+    aoc: AocManager,
+    day: int,
+    part: int,
+    data: str,
+    repeat: int = 10,
+    warmup: int = 1,
+    size: Optional[int] = None
+) -> BenchResult:
+    """Benchmark the solver for `day` and `part` on `data`.
+    The solver is run `warmup` times without measuring, then `repeat` times
+    measuring wall time, and finally once more under tracemalloc to get the
+    peak memory usage (which is kept separate because tracing slows down the
+    solver considerably).
+    `size` is only recorded in the result to tell apart runs on generated
+    inputs of different sizes."""
+    assert repeat >= 1
+    for _ in range(warmup):
+        aoc.run(day, part, data)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        aoc.run(day, part, data)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        aoc.run(day, part, data)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    if len(times) > 1:
+        p95 = statistics.quantiles(times, n=20, method='inclusive')[-1]
+    else:
+        p95 = times[0]
+
+    return BenchResult(day, part, repeat, min(times), statistics.median(times),
+                       p95, peak_memory, size)
+
+
+def save_baseline(results: Iterable[BenchResult], path: str) -> None:
+    baseline = {r.key: r._asdict() for r in results}
+    with open(path, 'w') as file:
+        json.dump(baseline, file, indent=2)
+
+
+def load_baseline(path: str) -> dict[str, BenchResult]:
+    with open(path, 'r') as file:
+        return {k: BenchResult(**v) for k, v in json.load(file).items()}
+
+
+def compare_to_baseline(
+    results: Iterable[BenchResult],
+    baseline: dict[str, BenchResult],
+    tolerance: float = 2.0
+) -> list[tuple[BenchResult, BenchResult]]:
+    """Return (result, baseline) pairs of all results whose median time is more
+    than `tolerance` times the median time in the baseline."""
+    return [(r, baseline[r.key]) for r in results
+            if r.key in baseline and r.median > tolerance * baseline[r.key].median]
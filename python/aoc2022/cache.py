@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+
+__all__ = ['ResultCache']
+
+
+class ResultCache:
+    """
+    Persistent on-disk cache of solver results.
+
+    Entries are keyed on the day, the part, the SHA-256 hash of the input and
+    the hash of the source of the module defining the solver and of the
+    modules of its package it depends on (e.g. `aoc2022.utils`), so changing a
+    day's code invalidates only the entries of that day. Each entry is stored
+    as a separate JSON file in `directory`; when the total size of the entries
+    exceeds `max_size` bytes, the least recently used ones are evicted.
+    """
+
+    def __init__(self, directory: str, max_size: int = 64 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self._source_hashes: dict[str, str] = {}
+
+    def key(self, day: int, part: int, data: str, solver: Callable) -> str:
+        input_hash = hashlib.sha256(data.encode()).hexdigest()
+        return f'day{day:02d}-part{part}-{input_hash[:32]}-{self._source_hash(solver)[:16]}'
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Return the cached results for `key`, or `None` on a cache miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as file:
+                results = json.load(file)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass  # evicted by another process in the meantime
+        return tuple(results)
+
+    def put(self, key: str, results: tuple) -> None:
+        """Store `results` under `key` (unless they can't be serialized)."""
+        try:
+            raw = json.dumps(results)
+        except TypeError:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(key) + f'.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w') as file:
+                file.write(raw)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits."""
+        # Temporary files older than this aren't being written anymore.
+        stale_before = time.time() - 60
+        entries = []
+        for entry in os.scandir(self.directory):
+            # Other processes may remove entries while scanning.
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.endswith('.json'):
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+            elif entry.name.endswith('.tmp') and stat.st_mtime < stale_before:
+                # Left behind by a process that was killed while writing.
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def clear(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(('.json', '.tmp')):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.json')
+
+    def _source_hash(self, solver: Callable[..., Any]) -> str:
+        name = solver.__module__
+        if name not in self._source_hashes:
+            digest = hashlib.sha256()
+            for dependency in sorted(_dependencies(sys.modules[name])):
+                digest.update(dependency.encode())
+                path = sys.modules[dependency].__file__
+                assert path is not None
+                with open(path, 'rb') as file:
+                    digest.update(hashlib.sha256(file.read()).digest())
+            self._source_hashes[name] = digest.hexdigest()
+        return self._source_hashes[name]
+
+
+def _dependencies(module: ModuleType) -> set[str]:
+    """
+    Return the names of `module` and of the modules of the same top-level
+    package it (transitively) refers to in its globals.
+    """
+    package = module.__name__.partition('.')[0] + '.'
+    found = {module.__name__}
+    stack = [module]
+    while stack:
+        for value in vars(stack.pop()).values():
+            name: Optional[str]
+            if isinstance(value, ModuleType):
+                name = value.__name__
+            else:
+                name = getattr(value, '__module__', None)
+            if (isinstance(name, str) and name.startswith(package)
+                    and name not in found and name in sys.modules
+                    and getattr(sys.modules[name], '__file__', None)):
+                found.add(name)
+                stack.append(sys.modules[name])
+    return found
@@ -1,9 +1,42 @@
+from heapq import heappush, heappushpop
+from io import StringIO
+from typing import Iterable, Optional
+
 from aoc2022.manager import aoc
 
 
 @aoc.solver(day=1)
 def run(data: str):
-    bags = [[int(food) for food in bag.splitlines()]
-            for bag in data.split('\n\n')]
-    calories = [sum(x) for x in bags]
-    return max(calories), sum(sorted(calories, reverse=True)[:3])
+    calories = top_calories(StringIO(data), k=3)
+    return max(calories, default=0), sum(calories)
+
+
+def top_calories(lines: Iterable[str], k: int = 1) -> list[int]:
+    """
+    Return the `k` largest calorie totals carried by the elves, in descending
+    order.
+
+    The lines (e.g. an open file) are consumed one at a time, keeping only a
+    running total for the current elf and a heap of the `k` largest totals.
+    """
+    if k < 1:
+        raise ValueError(f"k must be positive, got {k}")
+    largest: list[int] = []
+    total: Optional[int] = None  # None in between elves
+    for line in lines:
+        if line.strip():
+            total = int(line) + (total or 0)
+        elif total is not None:
+            add_total(largest, total, k)
+            total = None
+    if total is not None:
+        add_total(largest, total, k)
+    return sorted(largest, reverse=True)
+
+
+def add_total(largest: list[int], total: int, k: int) -> None:
+    """Add a total to the min-heap `largest` of at most `k` totals."""
+    if len(largest) < k:
+        heappush(largest, total)
+    elif total > largest[0]:
+        heappushpop(largest, total)
@@ -1,3 +1,5 @@
+from typing import Callable
+
 from aoc2022.manager import aoc
 
 
@@ -6,28 +8,35 @@ Value = int
 
 @aoc.solver(day=2, part=1)
 def part1(data: str):
-    strategy_guide = parse(data)
-
     def total_score(opp_shape: Value, my_shape: Value) -> int:
         outcome = (my_shape - opp_shape + 1) % 3
         return score(my_shape) + 3 * outcome
 
-    return sum(total_score(*rnd) for rnd in strategy_guide)
+    return strategy_guide_score(data, score_table(total_score))
 
 
 @aoc.solver(day=2, part=2)
 def part2(data: str):
-    strategy_guide = parse(data)
-
     def total_score(opp_shape: Value, target_outcome: Value):
         my_shape = (opp_shape + (target_outcome - 1)) % 3
         return score(my_shape) + 3 * target_outcome
 
-    return sum(total_score(*rnd) for rnd in strategy_guide)
+    return strategy_guide_score(data, score_table(total_score))
+
+
+def score_table(total_score: Callable[[Value, Value], int]) -> dict[str, int]:
+    """Tabulate the score of each of the 9 possible lines of the guide."""
+    return {f'{a} {b}': total_score(to_value(a), to_value(b))
+            for a in 'ABC' for b in 'XYZ'}
 
 
-def parse(data: str) -> list[tuple[Value, Value]]:
-    return [tuple(map(to_value, line.split())) for line in data.splitlines()]
+def strategy_guide_score(data: str, table: dict[str, int]) -> int:
+    """
+    Sum the scores of all rounds by counting how often each possible line
+    occurs. A line can't match across a line break, so this comes down to 9
+    substring counts over the input.
+    """
+    return sum(score * data.count(line) for line, score in table.items())
 
 
 def to_value(s: str) -> Value:
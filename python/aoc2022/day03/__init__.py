@@ -1,37 +1,34 @@
-from typing import Iterable
+from string import ascii_letters
 
 from aoc2022.manager import aoc
-from aoc2022.utils import chunks
 
 
-@aoc.solver(day=3)
-def run(data: str):
-    rucksacks = data.splitlines()
-    return (
-        shared_items_priority_sum(compartments(r) for r in rucksacks),
-        shared_items_priority_sum(chunks(rucksacks, 3))
-    )
-
-
-def compartments(rucksack: str) -> tuple[str, str]:
-    """Extract the two equal compartments of the rucksack."""
-    s = len(rucksack) // 2
-    return rucksack[:s], rucksack[s:]
+def priority_table() -> list[int]:
+    """Return the priority of each item type, indexed by its byte value."""
+    table = [0] * 256
+    for priority, item in enumerate(ascii_letters.encode(), start=1):
+        table[item] = priority
+    return table
 
 
-def shared_items_priority_sum(groups_list: Iterable[Iterable[str]]) -> int:
-    """Calculate the sum of the priority of the shared item of each group."""
-    return sum(priority(shared_items(*x)) for x in groups_list)
+PRIORITIES = priority_table()
 
 
-def shared_items(*groups: str) -> str:
-    """Find the single item shared by all groups."""
-    shared = set(groups[0]).intersection(*groups[1:])
-    assert (len(shared) == 1)
-    return next(iter(shared))
-
-
-def priority(item: str) -> int:
-    """Get the priority of the given item type."""
-    c = ord(item)
-    return (c - ord('A') + 27) if c < ord('a') else (c - ord('a') + 1)
+@aoc.solver(day=3)
+def run(data: str):
+    rucksacks = data.encode().splitlines()
+    assert len(rucksacks) % 3 == 0
+
+    compartments_sum = 0
+    for rucksack in rucksacks:
+        s = len(rucksack) // 2
+        # Unpacking the shared items asserts there's exactly one.
+        (item,) = set(rucksack[:s]).intersection(rucksack[s:])
+        compartments_sum += PRIORITIES[item]
+
+    badges_sum = 0
+    for first, *others in zip(*[iter(rucksacks)] * 3):
+        (item,) = set(first).intersection(*others)
+        badges_sum += PRIORITIES[item]
+
+    return compartments_sum, badges_sum
@@ -1,30 +1,64 @@
-from typing import Callable, Iterator
+from array import array
+from typing import Callable
 
 from aoc2022.manager import aoc
+from aoc2022.utils import IntervalIndex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
 
 
 @aoc.solver(day=4)
 def run(data: str):
-    section_assignments = list(parse(data))
+    bounds = parse(data)
+    if np is not None:
+        return overlap_counts_array(bounds)
     return (
-        overlap_count(section_assignments, overlap_fully),
-        overlap_count(section_assignments, overlap_partially)
+        overlap_count(bounds, overlap_fully),
+        overlap_count(bounds, overlap_partially)
     )
 
 
-def parse(data: str) -> Iterator[tuple[int, int, int, int]]:
-    for line in data.splitlines():
-        yield tuple(int(x) for p in line.split(',') for x in p.split('-'))
+def parse(data: str) -> array:
+    """
+    Parse the assignment pairs into one flat array of section bounds, four
+    per pair: start1, end1, start2, end2.
+    """
+    sections = data.replace('-', ' ').replace(',', ' ').split()
+    return array('q', map(int, sections))
 
 
 def overlap_count(
-    section_assignments: list[tuple[int, int, int, int]],
+    bounds: array,
     check_overlap: Callable[[int, int, int, int], bool],
 ):
     """
     Count the number of assignment pairs that overlap according to a predicate.
     """
-    return sum(int(check_overlap(*bounds)) for bounds in section_assignments)
+    return sum(map(check_overlap, bounds[0::4], bounds[1::4], bounds[2::4],
+                   bounds[3::4]))
+
+
+def overlap_counts_array(bounds: array) -> tuple[int, int]:
+    """
+    Count the fully and the partially overlapping assignment pairs at once,
+    using NumPy.
+    """
+    pairs = np.frombuffer(bounds, dtype=np.int64).reshape(-1, 4)
+    start1, end1, start2, end2 = pairs.T
+    fully = (start2 - start1) * (end2 - end1) <= 0
+    partially = (end2 - start1) * (start2 - end1) <= 0
+    return int(fully.sum()), int(partially.sum())
+
+
+def assignment_index(bounds: array) -> IntervalIndex:
+    """
+    Index the assignments of all elves, so the assignment of the second elf
+    of pair i gets index 2*i + 1.
+    """
+    return IntervalIndex(bounds[0::2], bounds[1::2])
 
 
 def overlap_fully(start1, end1, start2, end2) -> bool:
@@ -1,6 +1,5 @@
 from itertools import takewhile
 from typing import Iterator, NamedTuple
-import re
 
 from aoc2022.manager import aoc
 
@@ -9,8 +8,7 @@ from aoc2022.manager import aoc
 def part1(data: str):
     stacks, instructions = parse(data)
     for (n, from_i, to_i) in instructions:
-        for _ in range(n):
-            stacks[to_i].append(stacks[from_i].pop())
+        move_reversed(stacks[from_i], stacks[to_i], n)
     return top_of_stacks_str(stacks)
 
 
@@ -18,9 +16,7 @@ def part1(data: str):
 def part2(data: str):
     stacks, instructions = parse(data)
     for (n, from_i, to_i) in instructions:
-        tail = stacks[from_i][-n:]
-        del stacks[from_i][-n:]
-        stacks[to_i].extend(tail)
+        move(stacks[from_i], stacks[to_i], n)
     return top_of_stacks_str(stacks)
 
 
@@ -33,23 +29,43 @@ class Instruction(NamedTuple):
     to_i: int    # 0-based stack index
 
 
+def move(source: bytearray, target: bytearray, n: int) -> None:
+    """Move the top `n` crates of `source` at once, keeping their order."""
+    if n == 0:
+        return  # source[-0:] would be the whole stack
+    target += source[-n:]
+    del source[-n:]
+
+
+def move_reversed(source: bytearray, target: bytearray, n: int) -> None:
+    """Move the top `n` crates of `source` one by one, reversing their order."""
+    if n == 0:
+        return  # source[-0:] would be the whole stack
+    target += source[:-n - 1:-1]
+    del source[-n:]
+
+
 def parse(data: str):
     raw_stacks, raw_instructions = data.split('\n\n')
     return parse_stacks(raw_stacks), parse_instructions(raw_instructions)
 
 
-def parse_stacks(raw: str) -> list[list[str]]:
+def parse_stacks(raw: str) -> list[bytearray]:
+    """Parse the drawing into one stack of crates (bottom first) per column."""
     cols = (line[1::4] for line in reversed(raw.splitlines()[:-1]))
-    return [list(takewhile(str.isalpha, stack)) for stack in zip(*cols)]
+    return [bytearray(''.join(takewhile(str.isalpha, stack)), 'ascii')
+            for stack in zip(*cols)]
 
 
 def parse_instructions(raw: str) -> Iterator[Instruction]:
-    for line in raw.splitlines():
-        m = re.fullmatch(r'move (\d+) from (\d) to (\d)', line)
-        assert m is not None
-        values = list(map(int, m.groups()))
-        yield Instruction(values[0], values[1] - 1, values[2] - 1)
+    # Every instruction is six words: move <amount> from <from_i> to <to_i>
+    words = raw.split()
+    assert len(words) % 6 == 0
+    amounts = map(int, words[1::6])
+    from_indices = (int(w) - 1 for w in words[3::6])
+    to_indices = (int(w) - 1 for w in words[5::6])
+    return map(Instruction, amounts, from_indices, to_indices)
 
 
-def top_of_stacks_str(stacks: list[list[str]]) -> str:
-    return ''.join(s[-1] for s in stacks)
+def top_of_stacks_str(stacks: list[bytearray]) -> str:
+    return bytes(s[-1] for s in stacks).decode('ascii')
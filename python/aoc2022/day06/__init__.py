@@ -1,19 +1,69 @@
-from typing import Iterable
+from functools import partial
+from itertools import chain, takewhile
+from typing import BinaryIO, Iterable, Iterator, Sequence
 
 from aoc2022.manager import aoc
-from aoc2022.utils import sliding_window
 
 
 @aoc.solver(day=6)
 def run(data: str):
-    stream = data.splitlines()[0]
-    return first_marker_index(stream, 4), first_marker_index(stream, 14)
+    return tuple(first_marker_indices([data.encode()], (4, 14)))
 
 
-def first_marker_index(stream: Iterable[str], n: int) -> int:
+def first_marker_index(stream: bytes, n: int) -> int:
     """Find the index right after the first marker of size `n` in `stream`."""
-    stream = iter(stream)
-    for i, marker in enumerate(sliding_window(stream, n)):
-        if len(set(marker)) == n:
-            return i + n
-    raise AssertionError("stream doens't contain markers of size n")
+    return first_marker_indices([stream], (n,))[0]
+
+
+def first_marker_indices(
+    chunks: Iterable[bytes | memoryview],
+    sizes: Sequence[int]
+) -> list[int]:
+    """
+    Find the index right after the first marker of each of the given `sizes`
+    in a stream of lowercase letters, given as consecutive chunks (see
+    `read_chunks`). The stream ends at the first line break.
+
+    Each marker size has a window with a count per letter and the number of
+    distinct letters in it, which are updated in O(1) per character, so the
+    stream is scanned once without keeping more than the largest window.
+    """
+    assert sizes and all(n > 0 for n in sizes)
+    history = bytearray(max(sizes))  # ring buffer of the last characters
+    counts = [[0] * 26 for _ in sizes]
+    distinct = [0] * len(sizes)
+    found: list[int | None] = [None] * len(sizes)
+    remaining = len(sizes)
+
+    chars = takewhile(lambda c: c not in b'\r\n', chain.from_iterable(chunks))
+    for i, c in enumerate(chars):
+        c -= ord('a')
+        if not 0 <= c < 26:
+            raise ValueError(f"invalid character {chr(c + ord('a'))!r} at "
+                             f"index {i}, expected a lowercase letter")
+        for j, n in enumerate(sizes):
+            if found[j] is not None:
+                continue
+            window = counts[j]
+            if i >= n:
+                old = history[(i - n) % len(history)]
+                window[old] -= 1
+                if window[old] == 0:
+                    distinct[j] -= 1
+            if window[c] == 0:
+                distinct[j] += 1
+            window[c] += 1
+            if distinct[j] == n:
+                found[j] = i + 1
+                remaining -= 1
+        history[i % len(history)] = c
+        if remaining == 0:
+            return [index for index in found if index is not None]
+
+    missing = [n for n, index in zip(sizes, found) if index is None]
+    raise AssertionError(f"stream doesn't contain markers of size {missing}")
+
+
+def read_chunks(file: BinaryIO, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    """Read a file opened in binary mode in chunks of `chunk_size` bytes."""
+    return iter(partial(file.read, chunk_size), b'')
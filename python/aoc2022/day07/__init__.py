@@ -1,38 +1,49 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Iterator
+from bisect import bisect_left, bisect_right
+from io import StringIO
+from itertools import accumulate
+from typing import Iterable, Optional, Iterator
 
 from aoc2022.manager import aoc
 
 
 @aoc.solver(day=7)
 def run(data: str) -> tuple[int, int]:
-    terminal = Terminal()
+    index = FilesystemIndex(build_tree(StringIO(data)))
+    return part1(index), part2(index)
 
-    assert data[:2] == '$ '
-    for command, *output in map(str.splitlines, data[2:].split('\n$ ')):
-        terminal.reverse_execute(command, output)
 
+def build_tree(transcript: Iterable[str]) -> 'Directory':
+    """
+    Reconstruct the filesystem tree from the lines of a terminal transcript,
+    e.g. an open file. The lines are processed one at a time, so apart from
+    the tree itself only constant memory is used.
+    """
+    terminal = Terminal()
+    for line in transcript:
+        if line := line.rstrip('\n'):
+            terminal.reverse_execute_line(line)
     assert (cwd := terminal.cwd()) is not None
-    root = cwd.get_root()
-
-    return part1(root), part2(root)
+    return cwd.get_root()
 
 
-def part1(root: 'Directory') -> int:
-    sizes = (d.compute_size() for d in iter_all_directories(root))
-    return sum(s for s in sizes if s <= 100000)
+def part1(index: 'FilesystemIndex') -> int:
+    return index.total_size_at_most(100000)
 
 
-def part2(root: 'Directory') -> int:
-    sizes = (d.compute_size() for d in iter_all_directories(root))
-    used_space = root.compute_size()
+def part2(index: 'FilesystemIndex') -> int:
+    used_space = index.root.compute_size()
     disk_space, required_unused_space = 70000000, 30000000
     max_allowed_space = disk_space - required_unused_space
     space_to_delete = used_space - max_allowed_space
-    return min(s for s in sizes if s >= space_to_delete)
+    directory = index.smallest_at_least(space_to_delete)
+    assert directory is not None
+    return directory.compute_size()
 
 
 class FSNode(ABC):
+    __slots__ = '_name', '_parent'
+
     _name: str
     _parent: Optional['Directory']
 
@@ -59,19 +70,42 @@ class FSNode(ABC):
 
 
 class Directory(FSNode):
+    __slots__ = '_children', '_subdirectories', '_size'
+
     _children: dict[str, FSNode]
+    _subdirectories: list['Directory']
+    _size: Optional[int]  # cached size, None if it has to be (re)computed
 
     def __init__(self, name: str, parent: Optional['Directory'] = None) -> None:
         super().__init__(name, parent)
         self._children = dict()
+        self._subdirectories = []
+        self._size = None
 
     @property
     def subdirectories(self) -> list['Directory']:
-        return [d for d in self._children.values() if isinstance(d, Directory)]
+        """The child directories. (Don't modify the returned list.)"""
+        return self._subdirectories
 
     # override
     def compute_size(self) -> int:
-        return sum(x.compute_size() for x in self._children.values())
+        """Return the total size of the directory's contents.
+        The size is cached, so computing the sizes of all directories of a
+        tree takes linear time. Adding a child invalidates the cached sizes of
+        the directory and its ancestors."""
+        if self._size is None:
+            # Find the uncached directories in pre-order and compute their
+            # sizes in reverse, so each one only sums already computed sizes.
+            uncached = []
+            stack = [self]
+            while stack:
+                d = stack.pop()
+                uncached.append(d)
+                stack.extend(s for s in d._subdirectories if s._size is None)
+            for d in reversed(uncached):
+                d._size = sum(x.compute_size() for x in d._children.values())
+        assert self._size is not None
+        return self._size
 
     def has_child(self, name: str) -> bool:
         return name in self._children
@@ -81,17 +115,32 @@ class Directory(FSNode):
 
     def add_child(self, node: FSNode) -> None:
         assert node is not self and node is not self.parent
+        if isinstance(replaced := self._children.get(node.name), Directory):
+            self._subdirectories.remove(replaced)
         if isinstance(node, Directory):
             node.parent = self
+            self._subdirectories.append(node)
         self._children[node.name] = node
+        self._invalidate_size()
+
+    def _invalidate_size(self) -> None:
+        # A cached size implies that the sizes of all subdirectories are
+        # cached too, so the ancestors of an uncached directory are uncached.
+        d: Optional[Directory] = self
+        while d is not None and d._size is not None:
+            d._size = None
+            d = d.parent
 
     def get_root(self) -> 'Directory':
-        if self.parent is None:
-            return self
-        return self.parent.get_root()
+        d = self
+        while d.parent is not None:
+            d = d.parent
+        return d
 
 
 class File(FSNode):
+    __slots__ = '_size',
+
     _size: int
 
     def __init__(
@@ -110,9 +159,11 @@ class File(FSNode):
 
 class Terminal:
     _cwd: Optional[Directory]
+    _listing: bool  # whether the last command executed line by line was `ls`
 
     def __init__(self) -> None:
         self._cwd = None
+        self._listing = False
 
     def cwd(self) -> Optional[Directory]:
         return self._cwd
@@ -127,6 +178,17 @@ class Terminal:
         else:
             raise AssertionError(f'unknown command: {cmd_name}')
 
+    def reverse_execute_line(self, line: str) -> None:
+        """Process a single line of a transcript: a command or a line of the
+        output of the preceding `ls` command."""
+        if line.startswith('$ '):
+            cmd_name = line[2:].split(maxsplit=1)[0]
+            self.reverse_execute(line[2:], [])
+            self._listing = cmd_name == 'ls'
+        else:
+            assert self._listing, f'unexpected output: {line}'
+            self.reverse_ls_entry(line)
+
     def cd(self, path: str) -> None:
         if path == '..':
             assert self._cwd and self._cwd.parent
@@ -138,11 +200,15 @@ class Terminal:
 
     def reverse_ls(self, output: list[str]) -> None:
         assert self._cwd is not None
-        for specifier, name in map(str.split, output):
-            if specifier == 'dir':
-                self.mkdir(name)
-            else:
-                self.touch(name, size=int(specifier))
+        for entry in output:
+            self.reverse_ls_entry(entry)
+
+    def reverse_ls_entry(self, entry: str) -> None:
+        specifier, name = entry.split()
+        if specifier == 'dir':
+            self.mkdir(name)
+        else:
+            self.touch(name, size=int(specifier))
 
     def mkdir(self, name: str) -> Directory:
         assert self._cwd is not None
@@ -167,7 +233,69 @@ class Terminal:
         return f
 
 
+class FilesystemIndex:
+    """
+    Index of a filesystem tree for answering queries about directory sizes
+    and paths.
+
+    Building the index takes O(n log n) time for n directories, after which
+    size threshold queries take O(log n) time. The tree must not be modified
+    while the index is in use.
+    """
+    _root: Directory
+    _directories: list[Directory]  # sorted by size
+    _sizes: list[int]               # the sizes of `_directories`
+    _size_sums: list[int]           # prefix sums of `_sizes`, starting at 0
+
+    def __init__(self, root: Directory) -> None:
+        self._root = root
+        root.compute_size()
+        self._directories = sorted(iter_all_directories(root),
+                                   key=Directory.compute_size)
+        self._sizes = [d.compute_size() for d in self._directories]
+        self._size_sums = list(accumulate(self._sizes, initial=0))
+
+    @property
+    def root(self) -> Directory:
+        return self._root
+
+    def __len__(self) -> int:
+        """Return the number of directories."""
+        return len(self._directories)
+
+    def directories_at_most(self, max_size: int) -> list[Directory]:
+        """Return all directories of at most `max_size`, smallest first."""
+        return self._directories[:bisect_right(self._sizes, max_size)]
+
+    def total_size_at_most(self, max_size: int) -> int:
+        """Return the sum of the sizes of all directories of at most `max_size`."""
+        return self._size_sums[bisect_right(self._sizes, max_size)]
+
+    def smallest_at_least(self, min_size: int) -> Optional[Directory]:
+        """Return the smallest directory of at least `min_size`, if any."""
+        i = bisect_left(self._sizes, min_size)
+        return self._directories[i] if i < len(self._directories) else None
+
+    def largest(self, k: int) -> list[Directory]:
+        """Return the `k` largest directories, largest first."""
+        return self._directories[:-k-1:-1] if k > 0 else []
+
+    def lookup(self, path: str) -> Optional[FSNode]:
+        """Return the node at the given absolute path (e.g. `/a/e`), if any."""
+        node: FSNode = self._root
+        for name in filter(None, path.split('/')):
+            if not isinstance(node, Directory) or not node.has_child(name):
+                return None
+            child = node.get_child(name)
+            assert child is not None
+            node = child
+        return node
+
+
 def iter_all_directories(root: Directory) -> Iterator[Directory]:
-    yield root
-    for d in root.subdirectories:
-        yield from iter_all_directories(d)
+    """Iterate over `root` and all directories below it in pre-order."""
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        yield d
+        stack.extend(reversed(d.subdirectories))
@@ -1,43 +1,147 @@
-from functools import partial
-from math import prod
-from typing import Iterator
+from typing import Callable, Iterator, Sequence
 
 from aoc2022.manager import aoc
-from aoc2022.utils import Grid, Point
+from aoc2022.utils import Grid
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
 
 
 @aoc.solver(day=8)
 def run(data: str) -> tuple[int, int]:
+    if np is not None:
+        visible, scenic_scores = survey_array(parse_array(data))
+        return int(visible.sum()), int(scenic_scores.max())
     grid = Grid.parse(data, int)
-    return part1(grid), part2(grid)
+    visible, scenic_scores = survey(grid)
+    return part1(visible), part2(scenic_scores)
+
+
+def part1(visible: list[list[bool]]) -> int:
+    return sum(map(sum, visible))
+
+
+def part2(scenic_scores: list[list[int]]) -> int:
+    return max(map(max, scenic_scores))
+
+
+def survey(grid: Grid[int]) -> tuple[list[list[bool]], list[list[int]]]:
+    """
+    Determine for each tree whether it's visible from outside the grid, and
+    its scenic score.
+
+    Every row and column is swept once in each direction, so this takes time
+    linear in the number of trees.
+    """
+    visible = [[False] * grid.width for _ in range(grid.height)]
+    scenic_scores = [[1] * grid.width for _ in range(grid.height)]
+
+    for y, row in enumerate(grid.rows()):
+        for vis, dist in look_both_ways(row):
+            for x in range(grid.width):
+                visible[y][x] = visible[y][x] or vis[x]
+                scenic_scores[y][x] *= dist[x]
+
+    for x, col in enumerate(grid.cols()):
+        for vis, dist in look_both_ways(col):
+            for y in range(grid.height):
+                visible[y][x] = visible[y][x] or vis[y]
+                scenic_scores[y][x] *= dist[y]
+
+    return visible, scenic_scores
+
+
+def look_both_ways(
+    line: list[int]
+) -> tuple[tuple[list[bool], list[int]], tuple[list[bool], list[int]]]:
+    """Apply `look_back` towards both ends of the line."""
+    forward = look_back(line)
+    vis, dist = look_back(line[::-1])
+    return forward, (vis[::-1], dist[::-1])
+
+
+def look_back(line: Sequence[int]) -> tuple[list[bool], list[int]]:
+    """
+    For each tree in the line, determine whether it's visible from the start of
+    the line and its viewing distance towards the start of the line.
+    """
+    visible = []
+    distances = []
+    tallest = -1
+    # Indices of the trees that can still block the view of upcoming trees,
+    # in non-increasing order of height.
+    blocking: list[int] = []
+    for i, tree in enumerate(line):
+        while blocking and line[blocking[-1]] < tree:
+            blocking.pop()
+        visible.append(tree > tallest)
+        distances.append(i - blocking[-1] if blocking else i)
+        blocking.append(i)
+        if tree > tallest:
+            tallest = tree
+    return visible, distances
 
 
-def part1(grid: Grid[int]) -> int:
-    return sum(1 for p in grid.points() if is_visible(p, grid))
+# NumPy backend
 
 
-def part2(grid: Grid[int]) -> int:
-    return max(scenic_score(p, grid) for p in grid.points())
+def parse_array(data: str) -> 'np.ndarray':
+    """Parse the forest into a 2D array of tree heights (requires NumPy)."""
+    raw = data.replace('\r', '').rstrip('\n').encode() + b'\n'
+    width = raw.index(b'\n')
+    heights = np.frombuffer(raw, dtype=np.uint8).reshape(-1, width + 1)
+    return (heights[:, :width] - ord('0')).astype(np.int8)
 
 
-def is_visible(point: Point, grid: Grid[int]) -> bool:
-    tree = grid[point]
-    return any(max(v) < tree if v else True for v in get_views(point, grid))
+def survey_array(heights: 'np.ndarray') -> tuple['np.ndarray', 'np.ndarray']:
+    """
+    Vectorized version of `survey` working on an array of tree heights
+    (requires NumPy).
+    """
+    visible = np.zeros(heights.shape, dtype=bool)
+    for v in in_all_directions(visible_from_start, heights):
+        visible |= v
+    scenic_scores = np.ones(heights.shape, dtype=np.int64)
+    for d in in_all_directions(viewing_distances_to_start, heights):
+        scenic_scores *= d
+    return visible, scenic_scores
 
 
-def scenic_score(point: Point, grid: Grid[int]) -> int:
-    tree = grid[point]
-    return prod(map(partial(viewing_distance, tree), get_views(point, grid)))
+def in_all_directions(
+    f: Callable[['np.ndarray'], 'np.ndarray'],
+    a: 'np.ndarray'
+) -> Iterator['np.ndarray']:
+    """
+    Apply `f`, which looks towards the start of the rows, such that it looks
+    towards each of the four edges, and yield the results.
+    """
+    # Contiguous copies keep the row-wise operations in `f` fast.
+    transposed = np.ascontiguousarray(a.T)
+    yield f(a)
+    yield f(np.ascontiguousarray(a[:, ::-1]))[:, ::-1]
+    yield f(transposed).T
+    yield f(np.ascontiguousarray(transposed[:, ::-1]))[:, ::-1].T
 
 
-def viewing_distance(tree: int, view: list[int]) -> int:
-    return next((i+1 for i, h in enumerate(view) if h >= tree), len(view))
+def visible_from_start(heights: 'np.ndarray') -> 'np.ndarray':
+    """Determine whether each tree is visible from the start of its row."""
+    tallest_before = np.full_like(heights, -1)
+    np.maximum.accumulate(heights[:, :-1], axis=1, out=tallest_before[:, 1:])
+    return heights > tallest_before
 
 
-def get_views(point: Point, grid: Grid[int]) -> Iterator[list[int]]:
-    row = list(grid.row(point.y))
-    col = list(grid.col(point.x))
-    yield row[:point.x][::-1]   # towards left edge
-    yield row[point.x+1:]       # towards right edge
-    yield col[:point.y][::-1]   # towards top edge
-    yield col[point.y+1:]       # towards bottom edge
+def viewing_distances_to_start(heights: 'np.ndarray') -> 'np.ndarray':
+    """Determine the viewing distance of each tree towards the start of its row."""
+    width = heights.shape[1]
+    positions = np.arange(width, dtype=np.int16 if width < 2**15 else np.int32)
+    distances = np.zeros(heights.shape, dtype=positions.dtype)
+    closest = np.zeros(heights.shape, dtype=positions.dtype)
+    # Tree heights are single digits, so for each height find the position of
+    # the closest tree at least that tall (or the edge at position 0).
+    for height in range(10):
+        blocking = np.where(heights >= height, positions, 0)
+        np.maximum.accumulate(blocking[:, :-1], axis=1, out=closest[:, 1:])
+        np.subtract(positions, closest, out=distances, where=heights == height)
+    return distances
@@ -1,14 +1,19 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from itertools import pairwise
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
 
 from aoc2022.manager import aoc
-from aoc2022.utils import Point, MutablePoint, normalized, parse_direction, supdistance
+from aoc2022.utils import (FenwickTree, Point, MutablePoint, normalized,
+                           parse_direction, supdistance)
 
 
 @aoc.solver(day=9)
 def run(data: str):
     motions = list(map(parse_motion, data.splitlines()))
-    return simulate(create_rope(2), motions), simulate(create_rope(10), motions)
+    return (simulate_segments(create_rope(2), motions),
+            simulate_segments(create_rope(10), motions))
 
 
 def parse_motion(raw: str) -> tuple[Point, int]:
@@ -30,3 +35,176 @@ def simulate(rope: list[MutablePoint], motions: list[tuple[Point, int]]) -> int:
             follower += normalized(leader - follower)
         positions.add(rope[-1].to_frozen())
     return len(positions)
+
+
+def simulate_arrays(
+    rope: list[MutablePoint],
+    motions: list[tuple[Point, int]]
+) -> int:
+    """
+    Equivalent to `simulate`, but without creating any objects per step.
+
+    The knot coordinates are kept in two flat arrays and updated with plain
+    integer arithmetic, and the tail positions are stored in a set as single
+    ints packing both coordinates. The final positions are written back to
+    `rope`.
+    """
+    n = len(rope)
+    xs = array('i', (knot.x for knot in rope))
+    ys = array('i', (knot.y for knot in rope))
+    mask = 0xFFFFFFFF
+    positions = {(xs[-1] << 32) | (ys[-1] & mask)}
+    for direction, steps in motions:
+        dx, dy = direction.x, direction.y
+        for _ in range(steps):
+            xs[0] += dx
+            ys[0] += dy
+            for i in range(1, n):
+                ddx = xs[i-1] - xs[i]
+                ddy = ys[i-1] - ys[i]
+                if -1 <= ddx <= 1 and -1 <= ddy <= 1:
+                    break
+                xs[i] += (ddx > 0) - (ddx < 0)
+                ys[i] += (ddy > 0) - (ddy < 0)
+            else:
+                # Only reached when the tail moved.
+                positions.add((xs[-1] << 32) | (ys[-1] & mask))
+    for knot, x, y in zip(rope, xs, ys):
+        knot.x, knot.y = x, y
+    return len(positions)
+
+
+def simulate_segments(
+    rope: list[MutablePoint],
+    motions: list[tuple[Point, int]]
+) -> int:
+    """
+    Equivalent to `simulate`, but once every knot moves along with the head,
+    the rest of the motion is applied at once.
+
+    As soon as a step moves all knots in the direction of the motion, the rope
+    is in the same shape as before that step, so all following steps of the
+    motion do the same. Hence each motion only takes O(len(rope)) steps to
+    simulate, and the cells visited by the tail are recorded as segments.
+    """
+    tail = rope[-1]
+    visited = VisitedCells()
+    visited.add(tail)
+    for direction, steps in motions:
+        while steps > 0:
+            rope[0] += direction
+            steps -= 1
+            in_line = True
+            for leader, follower in pairwise(rope):
+                if supdistance(leader, follower) <= 1:
+                    in_line = False
+                    break
+                step = normalized(leader - follower)
+                in_line = in_line and step == direction
+                follower += step
+            else:
+                visited.add(tail)  # only reached if the tail moved
+            if in_line and steps > 0:
+                start = tail.to_frozen()
+                for knot in rope:
+                    knot += direction * steps
+                visited.add_segment(start, tail)
+                steps = 0
+    return len(visited)
+
+
+class VisitedCells:
+    """
+    Set of grid cells, stored as horizontal and vertical segments of cells.
+    """
+    # Segments are stored as flat arrays of bounds, two per segment.
+    _rows: dict[int, array]  # y -> [x_min, x_max, ...]
+    _cols: dict[int, array]  # x -> [y_min, y_max, ...]
+
+    def __init__(self) -> None:
+        self._rows = defaultdict(lambda: array('q'))
+        self._cols = defaultdict(lambda: array('q'))
+
+    def add(self, p: Point) -> None:
+        # Extend the last segment of the row if it contains or touches the
+        # cell, so a tail moving back and forth doesn't pile up segments.
+        row = self._rows[p.y]
+        if row and row[-2] - 1 <= p.x <= row[-1] + 1:
+            row[-2] = min(row[-2], p.x)
+            row[-1] = max(row[-1], p.x)
+        else:
+            row.extend((p.x, p.x))
+
+    def add_segment(self, p: Point, q: Point) -> None:
+        """Add all cells on the horizontal or vertical segment from p to q."""
+        if p.y == q.y:
+            self._rows[p.y].extend((min(p.x, q.x), max(p.x, q.x)))
+        elif p.x == q.x:
+            self._cols[p.x].extend((min(p.y, q.y), max(p.y, q.y)))
+        else:
+            raise ValueError(f'segment from {p} to {q} is not horizontal or vertical')
+
+    def __len__(self) -> int:
+        """Count the cells in O(s log s) time for s segments."""
+        rows = {y: merge_intervals(zip(iv[0::2], iv[1::2]))
+                for y, iv in self._rows.items()}
+        cols = {x: merge_intervals(zip(iv[0::2], iv[1::2]))
+                for x, iv in self._cols.items()}
+        count = sum(b - a + 1 for iv in rows.values() for a, b in iv)
+        count += sum(b - a + 1 for iv in cols.values() for a, b in iv)
+        return count - count_crossings(rows, cols)
+
+
+def merge_intervals(intervals: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merge overlapping and adjacent closed integer intervals."""
+    merged: list[tuple[int, int]] = []
+    for a, b in sorted(intervals):
+        if merged and a <= merged[-1][1] + 1:
+            if b > merged[-1][1]:
+                merged[-1] = (merged[-1][0], b)
+        else:
+            merged.append((a, b))
+    return merged
+
+
+def count_crossings(
+    rows: dict[int, list[tuple[int, int]]],
+    cols: dict[int, list[tuple[int, int]]]
+) -> int:
+    """
+    Count the cells covered by both a horizontal and a vertical segment, given
+    disjoint segments per row and per column, by sweeping from left to right.
+    """
+    ys = sorted(rows)
+    segments = [(x, a, b)
+                for x, intervals in cols.items() for a, b in intervals]
+    if not ys or not segments:
+        return 0
+    # Events are encoded as single integers (x, kind, payload), where the
+    # payload is the index of the row or of the column segment, so sorting
+    # them doesn't take a tuple per event. At the same x, rows are opened (0)
+    # before and closed (2) after querying the columns (1).
+    x0 = min(min(a for a, _ in iv) for iv in rows.values())
+    x0 = min(x0, min(cols))
+    m = max(len(ys), len(segments))
+    events = array('q')
+    for i, y in enumerate(ys):
+        for a, b in rows[y]:
+            events.append(((a - x0) * 3 + 0) * m + i)
+            events.append(((b - x0) * 3 + 2) * m + i)
+    for i, (x, _, _) in enumerate(segments):
+        events.append(((x - x0) * 3 + 1) * m + i)
+
+    open_rows = FenwickTree(len(ys))
+    crossings = 0
+    for event in sorted(events):
+        kind, i = divmod(event, m)
+        kind %= 3
+        if kind == 0:
+            open_rows.add(i, 1)
+        elif kind == 2:
+            open_rows.add(i, -1)
+        else:
+            _, a, b = segments[i]
+            crossings += open_rows.range_sum(bisect_left(ys, a), bisect_right(ys, b))
+    return crossings
@@ -1,60 +1,95 @@
 from aoc2022.manager import aoc
-from aoc2022.utils import chunks, starfilter
+from aoc2022.day10.vm import VM, Program
 
-import re
-from itertools import count, starmap
-from typing import Iterator, Optional, TypedDict
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, NamedTuple
 
 
 @aoc.solver(day=10, part=1)
 def part1(data: str) -> int:
-    interesting_states = starfilter(is_interesting, run_instructions(data))
-    return sum(starmap(signal_strength, interesting_states))
+    trace = execute(compile_program(data))
+    cycles = range(20, min(220, trace.cycles) + 1, 40)
+    return sum(signal_strengths(trace, cycles))
 
 
 @aoc.solver(day=10, part=2)
 def part2(data: str) -> str:
-    screen = starmap(derive_pixel, run_instructions(data))
-    return '\n'.join(''.join(x) for x in chunks(screen, 40))
+    return render(execute(compile_program(data)))
 
 
-class Registers(TypedDict):
-    x: int
-    p: int
+# The instruction set is the one of the VM. Only `addx` affects the output,
+# `noop` and `addp` only take up their cycles.
+MACHINE = VM()
+CYCLES = tuple(op.cycles for op in MACHINE.opcodes)  # indexed by opcode
+ADD = [op.name for op in MACHINE.opcodes].index('add')
+X = MACHINE.register('x')
 
 
-def run_instructions(data: str) -> Iterator[tuple[int, int]]:
+class Trace(NamedTuple):
     """
-    Run instructions and yield the cpu state at the start of each cycle.
+    The value of register X over the execution of a program, per instruction.
 
-    Yields (cycle, register['x']) pairs.
+    Instruction i runs during cycles `ends[i-1] + 1` up to `ends[i]` (with
+    `ends[-1]` taken as 0), while X has the value `xs[i]`. `xs[-1]` is the
+    final value of X.
     """
-    registers = Registers(x=1, p=1)
-    for cycle, op in zip(count(start=1), to_cpu_operations(data)):
-        yield cycle, registers['x']
-        if op:
-            registers[op[0]] += op[1]
+    ends: array  # cycle at which each instruction finishes
+    xs: array    # value of X when each instruction starts, plus the final X
 
+    @property
+    def cycles(self) -> int:
+        return self.ends[-1] if self.ends else 0
+
+    def x_during(self, cycle: int) -> int:
+        """Return the value of X during the given (1-based) cycle."""
+        if not 1 <= cycle <= self.cycles:
+            raise ValueError(f"cycle {cycle} outside of the program's "
+                             f"{self.cycles} cycles")
+        return self.xs[bisect_right(self.ends, cycle - 1)]
+
+
+def compile_program(raw: str) -> Program:
+    return MACHINE.compile(raw)
 
-def to_cpu_operations(raw: str) -> Iterator[Optional[tuple[str, int]]]:
-    """
-    Transform raw instructions in per-cycle cpu operations.
 
-    Yields either `None` if it's a noop, or `(register, value)` pairs to denote
-    that `value` should be added to `register`.
+def execute(program: Program, x: int = 1) -> Trace:
     """
-    for instruction in raw.splitlines():
-        yield None
-        if instruction != 'noop':
-            assert (m := re.fullmatch(r'add(\w) (-?\d+)', instruction))
-            yield m.group(1), int(m.group(2))
+    Execute a program, taking prefix sums of the instruction durations and
+    of the additions to X instead of stepping through its cycles.
+    """
+    ends = array('q', accumulate(CYCLES[op] for op in program.opcodes))
+    adds = (a if op == ADD and r == X else 0 for op, r, a in zip(*program))
+    xs = array('q', accumulate(adds, initial=x))
+    return Trace(ends, xs)
+
 
+def signal_strengths(trace: Trace, cycles: Iterable[int]) -> list[int]:
+    """Return the signal strength during each of the given cycles."""
+    return [cycle * trace.x_during(cycle) for cycle in cycles]
 
-def is_interesting(cycle: int, _x: int) -> bool:
-    return cycle in {20, 60, 100, 140, 180, 220}
 
-def signal_strength(cycle: int, x: int) -> int:
-    return cycle * x
+def render(trace: Trace, width: int = 40) -> str:
+    """
+    Draw the CRT image, drawing one pixel per cycle at the next position.
 
-def derive_pixel(cycle: int, x: int) -> str:
-        return '█' if (cycle - 1) % 40 in range(x-1, x+2) else ' '
+    The sprite is fixed during each instruction, so the pixels drawn by an
+    instruction are sliced from a precomputed row instead of derived one by
+    one. Rows are stored twice over, so a slice can wrap around to the next
+    line.
+    """
+    assert max(CYCLES) <= width
+    rows: dict[int, str] = {}
+    pixels = []
+    start = 0  # 0-based index of the first pixel of the instruction
+    for end, x in zip(trace.ends, trace.xs):
+        if x not in rows:
+            row = ''.join('█' if abs(col - x) <= 1 else ' '
+                          for col in range(width))
+            rows[x] = row + row
+        col = start % width
+        pixels.append(rows[x][col:col + end - start])
+        start = end
+    screen = ''.join(pixels)
+    return '\n'.join(screen[i:i + width] for i in range(0, len(screen), width))
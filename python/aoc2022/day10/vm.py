@@ -0,0 +1,150 @@
+"""
+A small virtual machine for programs in the day 10 format: one instruction
+per line, a mnemonic followed by an optional integer argument.
+
+The instruction set is a table of opcodes with a cycle cost each, so variants
+of the machine only need a different table. Observers sample the registers
+through a hook called every N cycles, instead of the machine yielding its
+state each cycle.
+"""
+
+from array import array
+from typing import Callable, Iterable, NamedTuple, Optional, Sequence
+
+
+__all__ = ['Opcode', 'Program', 'VM', 'DEFAULT_OPCODES']
+
+
+Operation = Callable[[array, int, int], None]  # (registers, register, arg)
+Hook = Callable[[int, array], None]            # (cycle, registers)
+
+
+class Opcode(NamedTuple):
+    """
+    An instruction of the machine. Its operation is applied to the register
+    file once all of its cycles have passed.
+    """
+    name: str
+    cycles: int
+    operation: Operation
+    per_register: bool = False  # the mnemonic ends with a register, e.g. addx
+    takes_arg: bool = False
+
+
+def noop(registers: array, register: int, arg: int) -> None:
+    pass
+
+
+def add(registers: array, register: int, arg: int) -> None:
+    registers[register] += arg
+
+
+DEFAULT_OPCODES = (
+    Opcode('noop', 1, noop),
+    Opcode('add', 2, add, per_register=True, takes_arg=True),
+)
+
+
+class Program(NamedTuple):
+    """Instructions compiled to parallel arrays."""
+    opcodes: array    # index in the opcode table
+    registers: array  # register operand, 0 if it has none
+    args: array       # integer argument, 0 if it has none
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+
+class VM:
+    opcodes: tuple[Opcode, ...]
+    register_names: tuple[str, ...]
+    initial: int
+    _mnemonics: dict[str, tuple[int, int, bool]]
+
+    def __init__(
+        self,
+        opcodes: Sequence[Opcode] = DEFAULT_OPCODES,
+        register_names: Sequence[str] = ('x', 'p'),
+        initial: int = 1
+    ) -> None:
+        self.opcodes = tuple(opcodes)
+        self.register_names = tuple(register_names)
+        self.initial = initial
+        if len(self.opcodes) > 256:
+            raise ValueError("at most 256 opcodes are supported")
+        if any(op.cycles < 1 for op in self.opcodes):
+            raise ValueError("every opcode must take at least one cycle")
+        # Map each mnemonic to its opcode, register operand and whether an
+        # argument follows.
+        self._mnemonics = {}
+        for i, op in enumerate(self.opcodes):
+            if op.per_register:
+                for r, name in enumerate(self.register_names):
+                    self._mnemonics[op.name + name] = (i, r, op.takes_arg)
+            else:
+                self._mnemonics[op.name] = (i, 0, op.takes_arg)
+
+    def register(self, name: str) -> int:
+        """Return the index of a register in the register file."""
+        return self.register_names.index(name)
+
+    def compile(self, raw: str) -> Program:
+        program = Program(array('B'), array('B'), array('q'))
+        words = iter(raw.split())
+        for word in words:
+            try:
+                opcode, register, takes_arg = self._mnemonics[word]
+            except KeyError:
+                raise ValueError(f"unknown instruction '{word}'") from None
+            program.opcodes.append(opcode)
+            program.registers.append(register)
+            program.args.append(int(next(words)) if takes_arg else 0)
+        return program
+
+    def run(
+        self,
+        program: Program,
+        hook: Optional[Hook] = None,
+        every: int = 1,
+        first: Optional[int] = None
+    ) -> array:
+        """
+        Execute a program and return the final register file.
+
+        If given, `hook` is called with the (1-based) cycle number and the
+        register file during cycles `first`, `first + every`, ... `first`
+        defaults to `every`. The hook must not modify the registers.
+        """
+        if every < 1:
+            raise ValueError(f"every must be positive, got {every}")
+        registers = array('q', [self.initial] * len(self.register_names))
+        if hook is None:
+            # Without samples, the cycles don't matter.
+            operations = [op.operation for op in self.opcodes]
+            for opcode, register, arg in zip(*program):
+                operations[opcode](registers, register, arg)
+            return registers
+
+        table = [(op.cycles, op.operation) for op in self.opcodes]
+        next_sample = every if first is None else first
+        cycle = 0
+        for opcode, register, arg in zip(*program):
+            cycles, operation = table[opcode]
+            cycle += cycles
+            # The registers only change after the last cycle of an
+            # instruction, so all samples during it see the same values.
+            while next_sample <= cycle:
+                hook(next_sample, registers)
+                next_sample += every
+            operation(registers, register, arg)
+        return registers
+
+    def run_many(
+        self,
+        programs: Iterable[Program],
+        hook: Optional[Hook] = None,
+        every: int = 1,
+        first: Optional[int] = None
+    ) -> list[array]:
+        """Execute each program and return their final register files."""
+        return [self.run(program, hook, every, first) for program in programs]
@@ -1,6 +1,8 @@
+from array import array
 from dataclasses import dataclass, field
-from itertools import pairwise
-from typing import Iterable
+from itertools import islice, pairwise
+from math import isqrt
+from typing import Callable, Iterable, Iterator, Sequence
 
 from aoc2022.manager import aoc
 
@@ -14,12 +16,26 @@ def run(data: str) -> tuple[int, int]:
 def decrypt(
     encrypted_file: Iterable[int],
     encryption_key: int = 1,
-    mix_rounds: int = 1
+    mix_rounds: int = 1,
+    engine: str = 'blocks'
 ) -> int:
     """
     Decrypt the data and return the sum of the grove coordinates' components.
+
+    `engine` selects the mixing implementation, see `MIXERS`.
+    """
+    values = [encryption_key * x for x in encrypted_file]
+    mixed = MIXERS[engine](values, mix_rounds)
+    zero_index = mixed.index(0)
+    return sum(mixed[(zero_index + i) % len(mixed)] for i in (1000, 2000, 3000))
+
+
+def mix_linked_list(values: list[int], mix_rounds: int) -> list[int]:
+    """
+    Mix using a circular doubly linked list, walking over the nodes to move
+    each one, i.e. O(n) per move.
     """
-    nodes = [Node(encryption_key * x) for x in encrypted_file]
+    nodes = [Node(x) for x in values]
 
     for n1, n2 in pairwise(nodes):
         n1.next = n2
@@ -30,12 +46,12 @@ def decrypt(
 
     for _ in range(mix_rounds):
         for node in nodes:
-            if node.value > 0:
+            if node.value % (len(nodes) - 1) == 0:
+                continue
+            elif node.value > 0:
                 target = node.forward(node.value % (len(nodes) - 1))
-            elif node.value < 0:
-                target = node.backward(abs(node.value) % (len(nodes) - 1)).prev
             else:
-                continue
+                target = node.backward(abs(node.value) % (len(nodes) - 1)).prev
 
             node.prev.next = node.next
             node.next.prev = node.prev
@@ -44,10 +60,70 @@ def decrypt(
             target.next.prev = node
             target.next = node
 
-    zero_node = next(n for n in nodes if n.value == 0)
+    return [node.value for node in islice(nodes[0], len(nodes))]
 
-    return sum((zero_node.forward(i % (len(nodes) - 1)).value
-                for i in (1000, 2000, 3000)))
+
+def mix_arrays(values: list[int], mix_rounds: int) -> Sequence[int]:
+    """
+    Mix using a circular doubly linked list stored in flat arrays of values
+    and of previous/next indices, instead of one object per node. Moves still
+    take O(n), but the list only takes 16 bytes per value (8 for the value, 4
+    for each link).
+    """
+    n = len(values)
+    vals = array('q', values)
+    prev = array('i', range(-1, n - 1))
+    next = array('i', range(1, n + 1))
+    prev[0], next[-1] = n - 1, 0
+
+    for _ in range(mix_rounds):
+        for i in range(n):
+            steps = vals[i] % (n - 1)
+            if steps == 0:
+                continue
+
+            p, q = prev[i], next[i]
+            next[p], prev[q] = q, p
+
+            # Find the node to insert after, walking in the shortest direction.
+            target = p
+            if 2 * steps < n - 1:
+                for _ in range(steps):
+                    target = next[target]
+            else:
+                for _ in range(n - 1 - steps):
+                    target = prev[target]
+
+            q = next[target]
+            next[target], prev[i], next[i], prev[q] = i, target, q, i
+
+    mixed = array('q')
+    node = 0
+    for _ in range(n):
+        mixed.append(vals[node])
+        node = next[node]
+    return mixed
+
+
+def mix_blocks(values: list[int], mix_rounds: int) -> list[int]:
+    """
+    Mix using a `BlockList` of the indices of the values, i.e. O(sqrt(n)) per
+    move.
+    """
+    order = BlockList(range(len(values)))
+    for _ in range(mix_rounds):
+        for i, value in enumerate(values):
+            index = order.index(i)
+            order.pop(index)
+            order.insert((index + value) % (len(values) - 1), i)
+    return [values[i] for i in order]
+
+
+MIXERS: dict[str, Callable[[list[int], int], Sequence[int]]] = {
+    'linked_list': mix_linked_list,
+    'arrays': mix_arrays,
+    'blocks': mix_blocks,
+}
 
 
 @dataclass(slots=True)
@@ -56,6 +132,13 @@ class Node:
     prev: 'Node' = field(init=False)
     next: 'Node' = field(init=False)
 
+    def __iter__(self) -> Iterator['Node']:
+        """Iterate (endlessly) over the nodes, starting from this one."""
+        node = self
+        while True:
+            yield node
+            node = node.next
+
     def forward(self, steps: int) -> 'Node':
         target = self
         for _ in range(steps):
@@ -67,3 +150,67 @@ class Node:
         for _ in range(steps):
             target = target.prev
         return target
+
+
+class BlockList:
+    """
+    Sequence of the distinct integers 0, ..., n-1 in some order, split into
+    blocks of O(sqrt(n)) items.
+
+    Finding the index of an item, and removing or inserting an item at an index
+    takes O(sqrt(n)) time. The blocks are rebuilt after every `block_size`
+    insertions to keep them balanced.
+    """
+    _block_size: int
+    _blocks: list[list[int]]
+    _block_of: list[int]  # index of the block containing each item
+    _insertions: int
+
+    def __init__(self, items: Iterable[int]) -> None:
+        items = list(items)
+        # Searching within a block is done by list methods, which are a lot
+        # faster than walking over the blocks in Python, so the blocks are
+        # made larger than sqrt(n).
+        self._block_size = max(1, 4 * isqrt(len(items)))
+        self._block_of = [0] * len(items)
+        self._rebuild(items)
+
+    def __len__(self) -> int:
+        return sum(map(len, self._blocks))
+
+    def __iter__(self) -> Iterator[int]:
+        for block in self._blocks:
+            yield from block
+
+    def index(self, item: int) -> int:
+        b = self._block_of[item]
+        return sum(map(len, islice(self._blocks, b))) + self._blocks[b].index(item)
+
+    def pop(self, index: int) -> int:
+        b, i = self._locate(index)
+        return self._blocks[b].pop(i)
+
+    def insert(self, index: int, item: int) -> None:
+        b, i = self._locate(index)
+        self._blocks[b].insert(i, item)
+        self._block_of[item] = b
+        self._insertions += 1
+        if self._insertions >= self._block_size:
+            self._rebuild(list(self))
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """Return the block containing `index`, and the index within it.
+        An index right after the last item is located in the last block."""
+        for b, block in enumerate(self._blocks):
+            if index < len(block):
+                return b, index
+            index -= len(block)
+        return len(self._blocks) - 1, len(self._blocks[-1]) + index
+
+    def _rebuild(self, items: list[int]) -> None:
+        size = self._block_size
+        self._blocks = [items[i:i+size] for i in range(0, len(items), size)] or [[]]
+        for b, block in enumerate(self._blocks):
+            for item in block:
+                self._block_of[item] = b
+        self._insertions = 0
@@ -0,0 +1,205 @@
+"""
+Deterministic generators of synthetic puzzle inputs of arbitrary size.
+
+The real puzzle inputs are too small to reveal the asymptotic behaviour of the
+solvers, so each implemented day has a generator producing a valid input for a
+given `size` (roughly the number of elements in the input: lines, cells,
+characters, ... see the individual generators) and `seed`.
+"""
+
+from math import isqrt
+from random import Random
+from string import ascii_letters, ascii_lowercase
+from typing import Callable
+
+
+__all__ = ['generate', 'generator_days']
+
+
+Generator = Callable[[Random, int], str]
+
+_generators: dict[int, Generator] = {}
+
+
+def generator(day: int) -> Callable[[Generator], Generator]:
+    def register(gen: Generator) -> Generator:
+        _generators[day] = gen
+        return gen
+    return register
+
+
+def generator_days() -> set[int]:
+    """Return the set of days for which an input generator exists."""
+    return set(_generators.keys())
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    """Generate an input for `day` of (approximately) the given `size`."""
+    if day not in _generators:
+        raise ValueError(f"there's no input generator for day {day}")
+    if size < 1:
+        raise ValueError("size must be positive")
+    return _generators[day](Random(seed), size)
+
+
+@generator(day=1)
+def day01(rng: Random, size: int) -> str:
+    """`size` food items, grouped per elf in bags of 1 to 10 items."""
+    bags = []
+    while size > 0:
+        n = min(size, rng.randint(1, 10))
+        bags.append('\n'.join(str(rng.randint(1000, 60000)) for _ in range(n)))
+        size -= n
+    return '\n\n'.join(bags) + '\n'
+
+
+@generator(day=2)
+def day02(rng: Random, size: int) -> str:
+    """`size` rounds."""
+    return ''.join(f'{rng.choice("ABC")} {rng.choice("XYZ")}\n' for _ in range(size))
+
+
+@generator(day=3)
+def day03(rng: Random, size: int) -> str:
+    """`size` rucksacks (rounded up to a multiple of 3) of 4 to 48 items."""
+    lines = []
+    for _ in range((size + 2) // 3):
+        letters = list(ascii_letters)
+        rng.shuffle(letters)
+        badge, pools = letters[0], (letters[1:18], letters[18:35], letters[35:52])
+        for pool in pools:
+            # The pools of a group only have the badge in common, and the
+            # compartments only share `shared` since their other items are
+            # drawn from disjoint sets.
+            items = pool + [badge]
+            rng.shuffle(items)
+            shared, sides = items[0], (items[1:9], items[9:])
+            k = rng.randint(2, 24)
+            halves = [[shared] + rng.choices(side, k=k - 1) for side in sides]
+            for side, half in zip(sides, halves):
+                if badge in side:
+                    half[1] = badge
+                rng.shuffle(half)
+            lines.append(''.join(halves[0] + halves[1]))
+    return '\n'.join(lines) + '\n'
+
+
+@generator(day=4)
+def day04(rng: Random, size: int) -> str:
+    """`size` pairs of section assignments within sections 1-99."""
+    def assignment() -> str:
+        a, b = sorted((rng.randint(1, 99), rng.randint(1, 99)))
+        return f'{a}-{b}'
+    return ''.join(f'{assignment()},{assignment()}\n' for _ in range(size))
+
+
+@generator(day=5)
+def day05(rng: Random, size: int) -> str:
+    """
+    `size` rearrangement instructions on 9 stacks, or on one stack per 1000
+    instructions for larger sizes.
+    """
+    n_stacks = max(9, size // 1000)
+    # Starting with more crates than stacks, some stack always has a crate to
+    # spare.
+    heights = [rng.randint(2, 8) for _ in range(n_stacks)]
+    stacks = [[rng.choice(ascii_letters[26:]) for _ in range(h)] for h in heights]
+
+    rows = []
+    for level in reversed(range(max(heights))):
+        rows.append(' '.join(f'[{s[level]}]' if level < len(s) else '   '
+                             for s in stacks))
+    rows.append(' '.join(f'{i + 1:^3}' for i in range(n_stacks)))
+
+    # Keep at least one crate on every stack so each stack has a top crate.
+    instructions = []
+    for _ in range(size):
+        from_i = rng.randrange(n_stacks)
+        while heights[from_i] == 1:
+            from_i = rng.randrange(n_stacks)
+        to_i = rng.randrange(n_stacks - 1)
+        to_i += to_i >= from_i
+        amount = rng.randint(1, heights[from_i] - 1)
+        heights[from_i] -= amount
+        heights[to_i] += amount
+        instructions.append(f'move {amount} from {from_i + 1} to {to_i + 1}')
+
+    return '\n'.join(rows) + '\n\n' + '\n'.join(instructions) + '\n'
+
+
+@generator(day=6)
+def day06(rng: Random, size: int) -> str:
+    """A stream of `size` characters whose first markers are at its end."""
+    # With only 3 distinct characters no marker can occur before the suffix.
+    prefix = ''.join(rng.choices('abc', k=max(0, size - 14)))
+    suffix = rng.sample(ascii_lowercase, 14)
+    return prefix + ''.join(suffix) + '\n'
+
+
+@generator(day=7)
+def day07(rng: Random, size: int) -> str:
+    """A terminal transcript exploring `size` directories.
+    New directories are mostly created in one of the most recently created
+    ones, which results in deep directory trees."""
+    parents = [-1]
+    for i in range(1, size):
+        parents.append(rng.randint(max(0, i - 4), i - 1))
+    children: list[list[int]] = [[] for _ in range(size)]
+    for i, p in enumerate(parents[1:], start=1):
+        children[p].append(i)
+
+    lines = ['$ cd /']
+    stack = [(0, False)]
+    while stack:
+        d, visited = stack.pop()
+        if visited:
+            lines.append('$ cd ..')
+            continue
+        if d != 0:
+            lines.append(f'$ cd d{d}')
+            stack.append((d, True))
+        lines.append('$ ls')
+        lines.extend(f'dir d{c}' for c in children[d])
+        lines.extend(f'{rng.randint(1, 300000)} f{j}.txt'
+                     for j in range(rng.randint(0, 5)))
+        stack.extend((c, False) for c in reversed(children[d]))
+    return '\n'.join(lines) + '\n'
+
+
+@generator(day=8)
+def day08(rng: Random, size: int) -> str:
+    """A square forest of (approximately) `size` trees."""
+    n = max(1, isqrt(size))
+    return ''.join(''.join(rng.choices('0123456789', k=n)) + '\n' for _ in range(n))
+
+
+@generator(day=9)
+def day09(rng: Random, size: int) -> str:
+    """`size` motions of 1 to 20 steps."""
+    return ''.join(f'{rng.choice("UDLR")} {rng.randint(1, 20)}\n' for _ in range(size))
+
+
+@generator(day=10)
+def day10(rng: Random, size: int) -> str:
+    """`size` instructions, keeping register X within the screen width."""
+    lines = []
+    x = 1
+    for _ in range(size):
+        if rng.random() < 0.3:
+            lines.append('noop')
+        else:
+            v = rng.randint(-10, 10)
+            if not 0 <= x + v < 40:
+                v = -v
+            x += v
+            lines.append(f'addx {v}')
+    return '\n'.join(lines) + '\n'
+
+
+@generator(day=20)
+def day20(rng: Random, size: int) -> str:
+    """An encrypted file of `size` numbers, exactly one of which is 0."""
+    size = max(size, 2)
+    values = [rng.choice((-1, 1)) * rng.randint(1, 10000) for _ in range(size - 1)]
+    values.insert(rng.randrange(size), 0)
+    return '\n'.join(map(str, values)) + '\n'
@@ -1,52 +1,142 @@
-from typing import Callable, Set, Dict, Any
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple, Optional, Set, Dict, Any
+import importlib
+import pkgutil
+import time
+
+if TYPE_CHECKING:
+    from .cache import ResultCache  # imported lazily, only needed with --cache
+
+
+Solver = Callable[[str], Any]
+
+
+class JobResult(NamedTuple):
+    """Outcome of a single (day, part) job run by `AocManager.solve_many`."""
+    day: int
+    part: int
+    results: tuple  # see `AocManager.run`
+    elapsed: float  # wall time of the solver in seconds
 
 
 class AocManager:
-    def __init__(self, year: int):
+    def __init__(self, year: int, package: Optional[str] = None):
+        """If `package` is given, its `dayXX` submodules are discovered without
+        importing them, and each one is only imported (registering its
+        solvers) once the solvers of that day are needed."""
         self.year = year
-        self._solvers: Dict[int, Dict[int, Callable[[str], None]]] = {}
+        self._solvers: Dict[int, Dict[int, Solver]] = {}
+        self._package = package
+        self._day_modules: Optional[Dict[int, str]] = None
+        self.cache: Optional['ResultCache'] = None  # opt-in cache used by `run`
 
     def days(self) -> Set[int]:
         """Return a set of all days who have at least one part for which a solver is registered."""
-        return set(self._solvers.keys())
+        return set(self._solvers.keys()) | set(self._discover_days().keys())
 
     def parts(self, day: int) -> Set[int]:
         """Return a set of all part numbers of the given `day` for which a solver is registered."""
+        self._load_day(day)
         return set(self._solvers[day].keys())
 
-    def solver(self, day: int, part: int = 3) -> Callable[[Callable[[str], Any]], Callable[[str], None]]:
-        def decorate_solver(solve: Callable[[str], Any]) -> Callable[[str], None]:
-            """Add the `solve` function as a solver for the given `day` and `part`."""
-            def decorated_solve(data: str):
-                result = solve(data)
-                if part == 3:
-                    for r in result:
-                        if r is not None:
-                            print(r)
-                elif result is not None:
-                    print(result)
+    def _discover_days(self) -> Dict[int, str]:
+        """Return the names of the `dayXX` modules in the package by day."""
+        if self._day_modules is None:
+            self._day_modules = {}
+            if self._package is not None:
+                path = importlib.import_module(self._package).__path__
+                for module in pkgutil.iter_modules(path):
+                    if module.name.startswith('day') and module.name[3:].isdigit():
+                        self._day_modules[int(module.name[3:])] = module.name
+        return self._day_modules
 
+    def _load_day(self, day: int) -> None:
+        """Import the module of the given `day` (if any) to register its solvers."""
+        day_modules = self._discover_days()
+        if day not in self._solvers and day in day_modules:
+            importlib.import_module(f'{self._package}.{day_modules[day]}')
+
+    def solver(self, day: int, part: int = 3) -> Callable[[Solver], Solver]:
+        def decorate_solver(solve: Solver) -> Solver:
+            """Add the `solve` function as a solver for the given `day` and `part`."""
             if day in self._solvers:
                 if part in self._solvers[day]:
                     print(
                         f"WARNING: Solver for day {day} part {part} implemented multiple times!")
-                self._solvers[day][part] = decorated_solve
+                self._solvers[day][part] = solve
             else:
-                self._solvers[day] = {part: decorated_solve}
+                self._solvers[day] = {part: solve}
 
-            return decorated_solve
+            return solve
 
         return decorate_solver
 
-    def solve(self, day: int, part: int, data: str) -> bool:
-        """Solve the given `day` and `part` using `data` as input.
-        Return whether that combination was implemented.
+    def run(self, day: int, part: int, data: str) -> tuple:
+        """Solve the given `day` and `part` using `data` as input and return
+        the results.
         part = 3 means both parts (but this only works if there's a solver that
-        can solve both parts at once for the given day)."""
+        can solve both parts at once for the given day), in which case the
+        tuple contains one result per part. Otherwise it contains the single
+        result of the requested part.
+        Raise a `ValueError` if that combination isn't implemented.
+        If a `cache` is set, results are looked up in and stored to it."""
         if day not in self.days() or part not in self.parts(day):
-            return False
-        self._solvers[day][part](data)
-        return True
+            raise ValueError(f"day {day} part {part} hasn't been implemented")
+        solve = self._solvers[day][part]
+        if self.cache is not None:
+            key = self.cache.key(day, part, data, solve)
+            if (results := self.cache.get(key)) is not None:
+                return results
+        result = solve(data)
+        results = tuple(result) if part == 3 else (result,)
+        if self.cache is not None:
+            self.cache.put(key, results)
+        return results
+
+    def solve_many(
+        self,
+        jobs: Iterable[tuple[int, int, str]],
+        workers: Optional[int] = None
+    ) -> list[JobResult]:
+        """Solve each `(day, part, data)` job and return the results in
+        submission order.
+        The jobs are distributed over a pool of `workers` processes (default:
+        the number of CPUs). With `workers == 1`, everything is solved in the
+        current process.
+        Otherwise, each worker receives a copy of this manager, so the solvers
+        must be picklable (i.e. module-level functions)."""
+        jobs = list(jobs)
+        for day, part, _ in jobs:
+            if day not in self.days() or part not in self.parts(day):
+                raise ValueError(f"day {day} part {part} hasn't been implemented")
+        if not jobs:
+            return []
+        if workers == 1:
+            return [self._solve_job(*job) for job in jobs]
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self,)) as executor:
+            return list(executor.map(_solve_job, *zip(*jobs)))
+
+    def _solve_job(self, day: int, part: int, data: str) -> JobResult:
+        start = time.perf_counter()
+        results = self.run(day, part, data)
+        return JobResult(day, part, results, time.perf_counter() - start)
+
+
+aoc = AocManager(2022, __package__)
+
+
+_worker_manager: Optional[AocManager] = None
+
+
+def _init_worker(manager: AocManager) -> None:
+    # The manager was validated by `solve_many`, so its copy already holds the
+    # solvers of every job, including its cache (if any).
+    global _worker_manager
+    _worker_manager = manager
 
 
-aoc = AocManager(2022)
+def _solve_job(day: int, part: int, data: str) -> JobResult:
+    # Entry point for worker processes.
+    assert _worker_manager is not None, "worker wasn't initialized"
+    return _worker_manager._solve_job(day, part, data)
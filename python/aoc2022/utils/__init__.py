@@ -2,3 +2,5 @@ from .utils import *
 from .grid import *
 from .point import *
 from .direction import *
+from .fenwick import *
+from .intervals import *
@@ -0,0 +1,35 @@
+__all__ = ['FenwickTree']
+
+
+class FenwickTree:
+    """
+    Binary indexed tree over the indices 0, ..., n-1, supporting point updates
+    and prefix sums in O(log n) time.
+    """
+    _tree: list[int]
+
+    def __init__(self, n: int) -> None:
+        self._tree = [0] * (n + 1)
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    def add(self, index: int, value: int) -> None:
+        """Add `value` to the element at `index`."""
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += value
+            i += i & -i
+
+    def prefix_sum(self, end: int) -> int:
+        """Return the sum of the elements at indices 0, ..., end-1."""
+        total = 0
+        i = end
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def range_sum(self, start: int, end: int) -> int:
+        """Return the sum of the elements at indices start, ..., end-1."""
+        return self.prefix_sum(end) - self.prefix_sum(start)
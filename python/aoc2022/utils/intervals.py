@@ -0,0 +1,120 @@
+from bisect import bisect_left, bisect_right
+from heapq import heappop, heappush
+from typing import Iterator, Optional, Sequence
+
+
+__all__ = ['IntervalIndex']
+
+
+class _Node:
+    __slots__ = 'center', 'by_start', 'by_end', 'left', 'right'
+
+    center: int
+    by_start: list[tuple[int, int]]  # (start, index), ascending
+    by_end: list[tuple[int, int]]    # (end, index), descending
+    left: Optional['_Node']
+    right: Optional['_Node']
+
+
+class IntervalIndex:
+    """
+    Static collection of closed integer intervals [start, end], answering
+    which intervals overlap a given section or range of sections.
+
+    Counting the overlapping intervals takes O(log n) time (using the sorted
+    starts and ends), reporting them takes O(log n + k) time for k results
+    (using a centered interval tree).
+    """
+    _starts: list[int]
+    _ends: list[int]
+    _sorted_starts: list[int]
+    _sorted_ends: list[int]
+    _root: Optional[_Node]
+
+    def __init__(self, starts: Sequence[int], ends: Sequence[int]) -> None:
+        assert len(starts) == len(ends)
+        assert all(s <= e for s, e in zip(starts, ends))
+        self._starts = list(starts)
+        self._ends = list(ends)
+        self._sorted_starts = sorted(starts)
+        self._sorted_ends = sorted(ends)
+        self._root = self._build(list(range(len(self._starts))))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def count_overlapping(self, lo: int, hi: Optional[int] = None) -> int:
+        """Count the intervals overlapping [lo, hi] (or containing lo)."""
+        hi = lo if hi is None else hi
+        # All intervals starting at most `hi`, except those ending before `lo`.
+        return (bisect_right(self._sorted_starts, hi)
+                - bisect_left(self._sorted_ends, lo))
+
+    def overlapping(self, lo: int, hi: Optional[int] = None) -> list[int]:
+        """
+        Return the indices of the intervals overlapping [lo, hi] (or
+        containing lo), in no particular order.
+        """
+        hi = lo if hi is None else hi
+        result: list[int] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if hi < node.center:
+                for start, i in node.by_start:
+                    if start > hi:
+                        break
+                    result.append(i)
+                stack.append(node.left)
+            elif lo > node.center:
+                for end, i in node.by_end:
+                    if end < lo:
+                        break
+                    result.append(i)
+                stack.append(node.right)
+            else:
+                result.extend(i for _, i in node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        return result
+
+    def overlapping_pairs(self) -> Iterator[tuple[int, int]]:
+        """
+        Yield every pair of indices (i, j) of overlapping intervals, with i
+        starting no later than j, sweeping the intervals by start in
+        O(n log n + k) time.
+        """
+        order = sorted(range(len(self._starts)), key=self._starts.__getitem__)
+        active: list[tuple[int, int]] = []  # (end, index) heap
+        for j in order:
+            start = self._starts[j]
+            while active and active[0][0] < start:
+                heappop(active)
+            for _, i in active:
+                yield i, j
+            heappush(active, (self._ends[j], j))
+
+    def _build(self, indices: list[int]) -> Optional[_Node]:
+        # The center is the median start, so each node holds at least one
+        # interval and both subtrees get at most half of the intervals.
+        if not indices:
+            return None
+        starts = sorted(self._starts[i] for i in indices)
+        center = starts[len(starts) // 2]
+        left, here, right = [], [], []
+        for i in indices:
+            if self._ends[i] < center:
+                left.append(i)
+            elif self._starts[i] > center:
+                right.append(i)
+            else:
+                here.append(i)
+        node = _Node()
+        node.center = center
+        node.by_start = sorted((self._starts[i], i) for i in here)
+        node.by_end = sorted(((self._ends[i], i) for i in here), reverse=True)
+        node.left = self._build(left)
+        node.right = self._build(right)
+        return node
@@ -1,7 +1,136 @@
 #!/usr/bin/env python3
 
 import argparse
+import json
+import sys
+import time
 from datetime import date
+from typing import Optional
+
+
+def parse_days(spec: str) -> list[int]:
+    """Parse a day specification such as `5` or `1-10,20` into a sorted list."""
+    days: set[int] = set()
+    for item in spec.split(','):
+        first, sep, last = item.strip().partition('-')
+        try:
+            start = int(first)
+            end = int(last) if sep else start
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid day specification: '{item}'")
+        if not 1 <= start <= end <= 25:
+            raise argparse.ArgumentTypeError(f"invalid day range: '{item}' (days are 1-25)")
+        days.update(range(start, end + 1))
+    return sorted(days)
+
+
+def read_input(day: int) -> str:
+    with open(f"input/day{day:02d}.txt", 'r') as file:
+        return file.read()
+
+
+def print_results(results: tuple) -> None:
+    for r in results:
+        if r is not None:
+            print(r)
+
+
+def print_json(day: int, part: int, results: tuple, elapsed: float) -> None:
+    """Print the results of a job as a single JSON object on one line."""
+    print(json.dumps({"day": day, "part": part, "results": results, "time": elapsed},
+                     default=str))
+
+
+def run_batch(aoc, jobs: list[tuple[int, int]], workers: int, as_json: bool) -> None:
+    """Solve each (day, part) job and print the results and a timing table."""
+    inputs = {day: read_input(day) for day in sorted({day for day, _ in jobs})}
+    start = time.perf_counter()
+    results = aoc.solve_many(((day, part, inputs[day]) for day, part in jobs), workers)
+    total_elapsed = time.perf_counter() - start
+
+    if as_json:
+        for r in results:
+            print_json(*r)
+        return
+
+    for r in results:
+        print(f"--- Day {r.day:2d}, part {r.part} ---")
+        print_results(r.results)
+
+    print()
+    print(f"{'Day':>3}  {'Part':>4}  {'Time (ms)':>10}")
+    for r in results:
+        print(f"{r.day:>3}  {r.part:>4}  {r.elapsed * 1000:>10.2f}")
+    print(f"{'Total':>9}  {sum(r.elapsed for r in results) * 1000:>10.2f}")
+    print(f"{'Wall':>9}  {total_elapsed * 1000:>10.2f}")
+
+
+def select_jobs(parser, aoc, days: list[int], part: Optional[int]) -> list[tuple[int, int]]:
+    """Return the (day, part) jobs to run for multiple days."""
+    if missing := [d for d in days if d not in aoc.days()]:
+        parser.error(f"day(s) {', '.join(map(str, missing))} haven't been implemented yet")
+    if part is None:
+        return [(d, p) for d in days for p in sorted(aoc.parts(d))]
+    jobs = [(d, part) for d in days if part in aoc.parts(d)]
+    if not jobs:
+        parser.error(f"part {part} hasn't been implemented for any of the given days")
+    return jobs
+
+
+def parse_sizes(spec: str) -> list[int]:
+    """Parse a comma-separated list of input sizes such as `1000,1e6`."""
+    try:
+        sizes = [int(float(s)) for s in spec.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size specification: '{spec}'")
+    if any(s < 1 for s in sizes):
+        raise argparse.ArgumentTypeError("sizes must be positive")
+    return sizes
+
+
+def run_bench(parser, aoc, args) -> None:
+    """Benchmark the selected days and optionally save or compare a baseline."""
+    from aoc2022.bench import bench, save_baseline, load_baseline, compare_to_baseline
+    from aoc2022.generators import generate, generator_days
+
+    if args.n < 1:
+        parser.error("the number of runs must be at least 1")
+
+    if args.size:
+        days = args.d or sorted(aoc.days() & generator_days())
+        if missing := [d for d in days if d not in generator_days()]:
+            parser.error(f"there's no input generator for day(s) {', '.join(map(str, missing))}")
+    else:
+        days = args.d or sorted(aoc.days())
+    jobs = select_jobs(parser, aoc, days, args.p)
+    baseline = load_baseline(args.compare) if args.compare else {}
+
+    print(f"{'Day':>3}  {'Part':>4}  {'Size':>9}  {'Min (ms)':>10}  {'Median (ms)':>11}  "
+          f"{'P95 (ms)':>10}  {'Peak (KiB)':>10}  {'Baseline':>8}")
+    results = []
+    for day in dict.fromkeys(d for d, _ in jobs):
+        for size in args.size or [None]:
+            if size is None:
+                data = read_input(day)
+            else:
+                data = generate(day, size, args.seed)
+            for part in (p for d, p in jobs if d == day):
+                r = bench(aoc, day, part, data, args.n, args.w, size)
+                results.append(r)
+                ratio = f"{r.median / baseline[r.key].median:7.2f}x" if r.key in baseline else ''
+                print(f"{r.day:>3}  {r.part:>4}  {r.size or '':>9}  {r.min * 1000:>10.2f}  "
+                      f"{r.median * 1000:>11.2f}  {r.p95 * 1000:>10.2f}  "
+                      f"{r.peak_memory / 1024:>10.1f}  {ratio:>8}", flush=True)
+
+    if args.save:
+        save_baseline(results, args.save)
+
+    if regressions := compare_to_baseline(results, baseline, args.tolerance):
+        print()
+        for r, b in regressions:
+            print(f"REGRESSION: day {r.day} part {r.part} took {r.median * 1000:.2f} ms "
+                  f"(baseline: {b.median * 1000:.2f} ms)")
+        sys.exit(1)
 
 
 def main():
@@ -23,25 +152,104 @@ def main():
         err_no_day_msg = f"Advent of Code {aoc.year} ended {delta_days - 25} days ago."
         today = None
     else:
-        today = delta_days
+        today = [delta_days]
 
     parser = argparse.ArgumentParser()
-    parser.add_argument("-d", metavar="DAY", type=int, choices=range(1, 26), default=today,
-                        help="day to run (default: today's day)")
+    day_group = parser.add_mutually_exclusive_group(required=False)
+    day_group.add_argument("-d", metavar="DAYS", type=parse_days, default=today,
+                           help="day(s) to run, e.g. `5` or `1-10,20` (default: today's day)")
+    day_group.add_argument("--all", action="store_true",
+                           help="run all implemented days")
     parser.add_argument("-p", metavar="PART", type=int, choices=[1, 2, 3], default=None,
-                        help="part to run (3: both if implemented, default: last implemented)")
+                        help="part to run (3: both if implemented, default: last implemented, "
+                             "or all implemented parts when running multiple days)")
+    parser.add_argument("-j", metavar="WORKERS", type=int, default=1,
+                        help="number of worker processes when running multiple days "
+                             "(0: one per CPU, default: 1)")
+    parser.add_argument("--json", action="store_true",
+                        help="print results as JSON lines (one object per day and part)")
+    parser.add_argument("--cache", metavar="DIR", nargs="?", const=".aoc-cache", default=None,
+                        help="cache results on disk in DIR (default: `.aoc-cache`), keyed on the "
+                             "input and the source of the day's solver")
+    parser.add_argument("--cache-size", metavar="MIB", type=float, default=64,
+                        help="maximum size of the cache in MiB (default: 64)")
     input_group = parser.add_mutually_exclusive_group(required=False)
     input_group.add_argument("-i", metavar="INPUT_STRING", type=str, default=None,
                              help="input string")
     input_group.add_argument("-f", metavar="INPUT_FILE", type=argparse.FileType('r'), default=None,
                              help="input filename (default: `input/dayXX.txt`)")
 
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    bench_parser = subparsers.add_parser("bench", help="benchmark the solvers")
+    bench_day_group = bench_parser.add_mutually_exclusive_group(required=False)
+    bench_day_group.add_argument("-d", metavar="DAYS", type=parse_days, default=None,
+                                 help="day(s) to benchmark, e.g. `5` or `1-10,20` "
+                                      "(default: all implemented days)")
+    bench_day_group.add_argument("--all", action="store_true",
+                                 help="benchmark all implemented days")
+    bench_parser.add_argument("-p", metavar="PART", type=int, choices=[1, 2, 3], default=None,
+                              help="part to benchmark (default: all implemented parts)")
+    bench_parser.add_argument("-n", metavar="RUNS", type=int, default=10,
+                              help="number of measured runs (default: 10)")
+    bench_parser.add_argument("-w", metavar="WARMUP", type=int, default=1,
+                              help="number of warmup runs (default: 1)")
+    bench_parser.add_argument("-s", "--size", metavar="SIZES", type=parse_sizes, default=None,
+                              help="benchmark on generated inputs of the given comma-separated "
+                                   "sizes instead of `input/dayXX.txt`, e.g. `1e3,1e4,1e5`")
+    bench_parser.add_argument("--seed", type=int, default=0,
+                              help="seed for the generated inputs (default: 0)")
+    bench_parser.add_argument("--save", metavar="FILE", type=str, default=None,
+                              help="save the results as a JSON baseline")
+    bench_parser.add_argument("--compare", metavar="FILE", type=str, default=None,
+                              help="compare the results to a JSON baseline and exit with a "
+                                   "non-zero status on regressions")
+    bench_parser.add_argument("--tolerance", metavar="FACTOR", type=float, default=2.0,
+                              help="maximum allowed slowdown of the median time compared to "
+                                   "the baseline (default: 2.0)")
+
+    generate_parser = subparsers.add_parser(
+        "generate", help="print a generated input for a single day")
+    generate_parser.add_argument("-d", metavar="DAY", type=int, choices=range(1, 26),
+                                 required=True, help="day to generate an input for")
+    generate_parser.add_argument("-s", "--size", metavar="SIZE", type=lambda s: int(float(s)),
+                                 required=True, help="size of the input, e.g. `1e6`")
+    generate_parser.add_argument("--seed", type=int, default=0,
+                                 help="seed for the generated input (default: 0)")
+
     args = parser.parse_args()
 
-    day = args.d
+    if args.cache is not None and args.command is None:
+        from aoc2022.cache import ResultCache
+        aoc.cache = ResultCache(args.cache, int(args.cache_size * 1024 * 1024))
+
+    if args.command == "bench":
+        run_bench(parser, aoc, args)
+        return
+
+    if args.command == "generate":
+        from aoc2022.generators import generate, generator_days
+        if args.d not in generator_days():
+            parser.error(f"there's no input generator for day {args.d}")
+        sys.stdout.write(generate(args.d, args.size, args.seed))
+        return
 
-    if day is None:
+    if args.all:
+        days = sorted(aoc.days())
+    elif args.d is None:
         parser.error(err_no_day_msg)
+    else:
+        days = args.d
+
+    if len(days) > 1 or args.all:
+        if args.j < 0:
+            parser.error("the number of workers can't be negative")
+        if args.i or args.f:
+            parser.error("an input string or file can only be given for a single day")
+        jobs = select_jobs(parser, aoc, days, args.p)
+        run_batch(aoc, jobs, args.j or None, args.json)
+        return
+
+    day = days[0]
 
     if day not in aoc.days():
         parser.error(f"day {day} hasn't been implemented yet")
@@ -57,11 +265,14 @@ def main():
         data = args.f.read()
         args.f.close()
     else:
-        file = open(f"input/day{day:02d}.txt", 'r')
-        data = file.read()
-        file.close()
+        data = read_input(day)
 
-    aoc.solve(day, part, data)
+    if args.json:
+        start = time.perf_counter()
+        results = aoc.run(day, part, data)
+        print_json(day, part, results, time.perf_counter() - start)
+    else:
+        print_results(aoc.run(day, part, data))
 
 
 if __name__ == '__main__':